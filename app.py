@@ -1,33 +1,42 @@
 import streamlit as st
-from rules import latest_financial_index, iscr_flag, total_revenue_5cr_flag, iscr, borrowing_to_revenue_flag
-import json
+from model import probe_model_5l_profit, probe_model_5l_profit_stream
+import hashlib
+import io
+import ijson  # type: ignore[import-untyped]
+import orjson
 
-def probe_model_5l_profit(data: dict):
+# Uploads at least this large are stream-parsed instead of being parsed into a full document tree
+STREAM_PARSE_MIN_BYTES = 8 * 1024 * 1024
+
+# Number of distinct uploads whose results are kept, shared across sessions
+CACHE_MAX_ENTRIES = 1024
+
+
+def _content_key(content_bytes: bytes) -> bytes:
+    """Digest identifying an upload's content, used as the cache key in place of the bytes themselves."""
+    return hashlib.blake2b(content_bytes, digest_size=16).digest()
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def _compute(key: bytes, _content_bytes: bytes) -> dict:
     """
-    Evaluate various financial flags for the model.
+    Parse the uploaded JSON and evaluate the financial flags.
 
-    :param data: A dictionary containing financial data.
-    :return: A dictionary with the evaluated flag values.
+    Cached on the content key so reruns and other sessions replaying the same upload skip parsing and rule
+    evaluation. The leading underscore keeps Streamlit from hashing the full upload a second time.
     """
-    lastest_financial_index_value = latest_financial_index(data)
+    return probe_model_5l_profit(orjson.loads(_content_bytes)["data"])
 
-    total_revenue_5cr_flag_value = total_revenue_5cr_flag(
-        data, lastest_financial_index_value
-    )
 
-    borrowing_to_revenue_flag_value = borrowing_to_revenue_flag(
-        data, lastest_financial_index_value
-    )
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def _compute_streamed(key: bytes, _content_bytes: bytes) -> dict:
+    """
+    Stream-parse the uploaded JSON and evaluate the financial flags.
 
-    iscr_flag_value = iscr_flag(data, lastest_financial_index_value)
+    Used for large uploads, where building the full document tree would dominate peak memory.
+    """
+    return probe_model_5l_profit_stream(io.BytesIO(_content_bytes))
 
-    return {
-        "flags": {
-            "TOTAL_REVENUE_5CR_FLAG": total_revenue_5cr_flag_value,
-            "BORROWING_TO_REVENUE_FLAG": borrowing_to_revenue_flag_value,
-            "ISCR_FLAG": iscr_flag_value,
-        }
-    }
 
 def main():
     st.title("Financial Analysis Streamlit App")
@@ -36,17 +45,20 @@ def main():
 
     if uploaded_file is not None:
         try:
-            content = uploaded_file.read()
-            # convert to json
-            data = json.loads(content)
-            result = probe_model_5l_profit(data["data"])
+            # getvalue() always hands back the upload's own buffer, read() only does so from position 0
+            content = uploaded_file.getvalue()
+            key = _content_key(content)
+            if len(content) >= STREAM_PARSE_MIN_BYTES:
+                result = _compute_streamed(key, content)
+            else:
+                result = _compute(key, content)
 
             st.header("Financial Flags")
             st.write("TOTAL_REVENUE_5CR_FLAG:", result["flags"]["TOTAL_REVENUE_5CR_FLAG"])
             st.write("BORROWING_TO_REVENUE_FLAG:", result["flags"]["BORROWING_TO_REVENUE_FLAG"])
             st.write("ISCR_FLAG:", result["flags"]["ISCR_FLAG"])
 
-        except json.JSONDecodeError:
+        except (orjson.JSONDecodeError, ijson.JSONError):
             st.error("Invalid JSON file. Please upload a valid JSON file.")
 
 if __name__ == "__main__":
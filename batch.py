@@ -0,0 +1,151 @@
+# Batch and per-period evaluation of the model flags over NumPy columns. Kept out of `model` so the
+# Streamlit app, which only scores single uploads, does not import NumPy or numba on cold start.
+from typing import Callable, Optional
+
+import numpy as np
+from rules import (
+    AMBER,
+    BORROWING_RATIO_THRESHOLD,
+    GREEN,
+    ISCR_THRESHOLD,
+    RED,
+    REVENUE_5CR_THRESHOLD,
+    latest_financial_index,
+    line_items,
+)
+
+eval_flags: Optional[Callable[..., None]]
+try:
+    from rules_kernels import eval_flags
+except ImportError:  # numba is optional, fall back to plain NumPy expressions
+    eval_flags = None
+
+# Flag lookup tables, gathered with the outcome of each rule's threshold check as the index
+_RED_GREEN_LUT = np.array((RED, GREEN), dtype=np.int64)
+_AMBER_GREEN_LUT = np.array((AMBER, GREEN), dtype=np.int64)
+
+# Fields of a rule input row for one financial entry. The values of a missing pnl or bs section are NaN,
+# with has_pnl / has_bs telling whether the section exists. financials_array adds a "nature" string
+# field, sized to the longest nature in the data so no value is truncated.
+FINANCIALS_FIELDS = [
+    ("rev", "f8"),
+    ("lt", "f8"),
+    ("st", "f8"),
+    ("pbitda", "f8"),
+    ("int", "f8"),
+    ("has_pnl", "?"),
+    ("has_bs", "?"),
+]
+
+
+def _flag_inputs(pnl_section, bs_section):
+    """Rule inputs of a financial entry's sections as a FINANCIALS_FIELDS row."""
+    net_revenue = pbitda = long_term = short_term = interest = np.nan
+    if pnl_section is not None:
+        net_revenue = pnl_section.get("netRevenue", 0.0)
+        pbitda = pnl_section.get("profitBeforeInterestAndTaxAndDepreciationAndAmortization", 0)
+    if bs_section is not None:
+        long_term = bs_section.get("longTermBorrowings", 0)
+        short_term = bs_section.get("shortTermBorrowings", 0)
+        interest = bs_section.get("interestExpenses", 0)
+    return (
+        net_revenue, long_term, short_term, pbitda, interest, pnl_section is not None, bs_section is not None
+    )
+
+
+def _evaluate_flag_columns(inputs: np.ndarray) -> np.ndarray:
+    """Evaluate the three rules over a structured array of FINANCIALS_FIELDS, returning an (N, 3) array of flags."""
+    has_pnl = inputs["has_pnl"]
+    has_bs = inputs["has_bs"]
+
+    if eval_flags is not None:
+        flags = np.empty((3, inputs.shape[0]), dtype=np.int64)
+        eval_flags(
+            np.ascontiguousarray(inputs["rev"]),
+            np.ascontiguousarray(inputs["lt"]),
+            np.ascontiguousarray(inputs["st"]),
+            np.ascontiguousarray(inputs["pbitda"]),
+            np.ascontiguousarray(inputs["int"]),
+            np.ascontiguousarray(has_pnl),
+            np.ascontiguousarray(has_bs),
+            REVENUE_5CR_THRESHOLD,
+            BORROWING_RATIO_THRESHOLD,
+            ISCR_THRESHOLD,
+            GREEN,
+            AMBER,
+            RED,
+            flags[0],
+            flags[1],
+            flags[2],
+        )
+        return flags.T
+
+    # Missing sections score like the scalar rules: no revenue, a borrowing ratio of 0 and an ISCR of 0
+    net_revenue = np.where(has_pnl, inputs["rev"], 0.0)
+    total_revenue_5cr_flag_values = _RED_GREEN_LUT[(net_revenue >= REVENUE_5CR_THRESHOLD).astype(np.uint8)]
+
+    has_ratio = has_bs & (net_revenue != 0)
+    borrowing_to_revenue_ratio = np.where(
+        has_ratio, (inputs["lt"] + inputs["st"]) / np.where(has_ratio, net_revenue, 1), 0.0
+    )
+    borrowing_to_revenue_flag_values = _AMBER_GREEN_LUT[
+        (borrowing_to_revenue_ratio <= BORROWING_RATIO_THRESHOLD).astype(np.uint8)
+    ]
+
+    interest = inputs["int"]
+    has_iscr = has_pnl & has_bs & (interest + 1 != 0)
+    iscr_value = np.where(has_iscr, (inputs["pbitda"] + 1) / np.where(has_iscr, interest + 1, 1), 0.0)
+    iscr_flag_values = _RED_GREEN_LUT[(iscr_value >= ISCR_THRESHOLD).astype(np.uint8)]
+
+    return np.stack(
+        (total_revenue_5cr_flag_values, borrowing_to_revenue_flag_values, iscr_flag_values), axis=1
+    )
+
+
+def probe_model_5l_profit_batch(records: list[dict]) -> np.ndarray:
+    """
+    Evaluate the model flags for many companies at once.
+
+    The rule inputs of every record are extracted in one pass and the three rules are then evaluated
+    over the whole batch, by the fused numba kernel when numba is installed and as NumPy vector
+    operations otherwise.
+
+    :param records: A list of dictionaries containing financial data, one per company.
+    :return: An array of shape (len(records), 3) holding the TOTAL_REVENUE_5CR_FLAG,
+        BORROWING_TO_REVENUE_FLAG and ISCR_FLAG values of each record.
+    """
+    inputs = np.array(
+        [_flag_inputs(*line_items(data, latest_financial_index(data))) for data in records], dtype=FINANCIALS_FIELDS
+    )
+    return _evaluate_flag_columns(inputs)
+
+
+def financials_array(data: dict) -> np.ndarray:
+    """
+    Flatten the "financials" list into a structured array with one row per financial entry.
+
+    Built once per upload, it replaces the nested per-entry dictionary lookups of the rules with
+    typed numeric fields that can be evaluated for all entries at once. Values missing from a
+    present section default to 0 like in the rules, the values of a missing section are NaN.
+
+    :param data: A dictionary containing financial data.
+    :return: A structured array of FINANCIALS_FIELDS plus "nature", with one row per financial entry.
+    """
+    financials = data.get("financials") or ()
+    rows = []
+    for financial in financials:
+        items = financial.get("lineItems", {})
+        rows.append(_flag_inputs(items.get("pnl"), items.get("bs")) + (financial.get("nature") or "",))
+    nature_length = max((len(row[-1]) for row in rows), default=0) or 1
+    return np.array(rows, dtype=FINANCIALS_FIELDS + [("nature", f"U{nature_length}")])
+
+
+def probe_model_5l_profit_periods(data: dict) -> np.ndarray:
+    """
+    Evaluate the model flags for every financial period of a company at once.
+
+    :param data: A dictionary containing financial data.
+    :return: An array of shape (len(data["financials"]), 3) holding the TOTAL_REVENUE_5CR_FLAG,
+        BORROWING_TO_REVENUE_FLAG and ISCR_FLAG values of each financial entry.
+    """
+    return _evaluate_flag_columns(financials_array(data))
@@ -1,4 +1,17 @@
-from rules import latest_financial_index, iscr_flag, total_revenue_5cr_flag, iscr, borrowing_to_revenue_flag
+import ijson  # type: ignore[import-untyped]
+from rules import (
+    AMBER,
+    BORROWING_RATIO_THRESHOLD,
+    GREEN,
+    ISCR_THRESHOLD,
+    RED,
+    REVENUE_5CR_THRESHOLD,
+    latest_financial_index,
+    line_items,
+    section_total_revenue,
+    section_total_borrowing,
+    section_iscr,
+)
 import json
 
 
@@ -10,16 +23,17 @@ def probe_model_5l_profit(data: dict):
     :return: A dictionary with the evaluated flag values.
     """
     lastest_financial_index_value = latest_financial_index(data)
+    pnl_section, bs_section = line_items(data, lastest_financial_index_value)
 
-    total_revenue_5cr_flag_value = total_revenue_5cr_flag(
-        data, lastest_financial_index_value
-    )
+    total_rev = section_total_revenue(pnl_section)
+    borrowing_to_revenue_ratio = section_total_borrowing(bs_section, total_rev)
+    iscr_value = section_iscr(pnl_section, bs_section)
 
-    borrowing_to_revenue_flag_value = borrowing_to_revenue_flag(
-        data, lastest_financial_index_value
-    )
+    total_revenue_5cr_flag_value = GREEN if total_rev >= REVENUE_5CR_THRESHOLD else RED
 
-    iscr_flag_value = iscr_flag(data, lastest_financial_index_value)
+    borrowing_to_revenue_flag_value = GREEN if borrowing_to_revenue_ratio <= BORROWING_RATIO_THRESHOLD else AMBER
+
+    iscr_flag_value = GREEN if iscr_value >= ISCR_THRESHOLD else RED
 
     return {
         "flags": {
@@ -30,6 +44,34 @@ def probe_model_5l_profit(data: dict):
     }
 
 
+def probe_model_5l_profit_stream(file):
+    """
+    Evaluate various financial flags for the model while stream-parsing the uploaded JSON document.
+
+    Only the financial entries under "data.financials" are materialized, one at a time, and parsing stops
+    at the first standalone entry, so peak memory is bounded by a single entry rather than the whole document.
+
+    :param file: A seekable binary file-like object holding the full uploaded JSON document.
+    :return: A dictionary with the evaluated flag values.
+    """
+    latest_financial = None
+    for financial in ijson.items(file, "data.financials.item", use_float=True):
+        if latest_financial is None:
+            latest_financial = financial  # index 0 is used if no standalone entry exists
+        if financial.get("nature") == "STANDALONE":
+            latest_financial = financial
+            break
+
+    if latest_financial is None:
+        # Score like the parsed document would: no financials at all, or no "data" key to score
+        file.seek(0)
+        top_level_keys = (value for prefix, event, value in ijson.parse(file) if prefix == "" and event == "map_key")
+        if "data" not in top_level_keys:
+            raise KeyError("data")
+        return probe_model_5l_profit({})
+    return probe_model_5l_profit({"financials": [{"lineItems": latest_financial.get("lineItems", {})}]})
+
+
 if __name__ == "__main__":
     # data = json.loads("t.json")
     # print(data)
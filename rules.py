@@ -1,15 +1,25 @@
-import datetime
+# The rules are fully type annotated so the module can be compiled ahead of time with mypyc
+# (`mypyc rules.py`). The compiled extension is picked up by `import rules` in place of this file.
 
+# Flag values
+GREEN = 1
+AMBER = 2
+RED = 0
+MEDIUM_RISK = 3  # display purpose only
+WHITE = 4  # data is missing for this field
 
-class FLAGS:
-    GREEN = 1
-    AMBER = 2
-    RED = 0
-    MEDIUM_RISK = 3  # display purpose only
-    WHITE = 4  # data is missing for this field
+# Rule thresholds
+REVENUE_5CR_THRESHOLD = 50000000  # 50 million, GREEN at or above
+BORROWING_RATIO_THRESHOLD = 0.25  # GREEN at or below
+ISCR_THRESHOLD = 2  # GREEN at or above
+
+
+# Flag lookup tables indexed by the outcome of a rule's threshold check (False -> 0, True -> 1)
+_RED_GREEN_LUT = (RED, GREEN)
+_AMBER_GREEN_LUT = (AMBER, GREEN)
 
 # This is a already written for your reference
-def latest_financial_index(data: dict):
+def latest_financial_index(data: dict) -> int:
     """
     Determine the index of the latest standalone financial entry in the data.
 
@@ -23,13 +33,78 @@ def latest_financial_index(data: dict):
     Returns:
     - int: The index of the latest standalone financial entry or 0 if not found.
     """
-    for index, financial in enumerate(data.get("financials")):
-        if financial.get("nature") == "STANDALONE":
-            return index
-    return 0
+    financials = data.get("financials") or ()
+    return next(
+        (index for index, financial in enumerate(financials) if financial.get("nature") == "STANDALONE"),
+        0,
+    )
 
 
-def total_revenue(data: dict, financial_index):
+def line_items(data: dict, financial_index: int) -> tuple[dict | None, dict | None]:
+    """
+    Resolve the profit and loss ("pnl") and balance sheet ("bs") sections of the financial entry at the given index.
+
+    Rules evaluated together on the same entry should resolve the sections once with this function and
+    hand them to the section-level helpers, rather than re-indexing the nested data for every rule.
+
+    Parameters:
+    - data (dict): A dictionary containing financial data.
+    - financial_index (int): The index of the financial entry to be used.
+
+    Returns:
+    - tuple: The (pnl, bs) sections. A section is None if it is missing from the data.
+    """
+    financials = data.get("financials") or ()
+    in_range = -len(financials) <= financial_index < len(financials)
+    financial = financials[financial_index] if in_range else {}
+    line_items = financial.get("lineItems", {})
+    return line_items.get("pnl"), line_items.get("bs")
+
+
+def section_total_revenue(pnl: dict | None) -> float:
+    """Net revenue from a pnl section, 0 if it is missing."""
+    if pnl is None:
+        return 0.0
+    return pnl.get("netRevenue", 0.0)
+
+
+def section_total_borrowing(bs: dict | None, total_rev: float) -> float:
+    """Borrowings to revenue ratio from a bs section and an already computed total revenue, 0 if it cannot be computed."""
+    if bs is None:
+        return 0.0
+    total_borrowings = bs.get("longTermBorrowings", 0) + bs.get("shortTermBorrowings", 0)
+    if total_rev != 0:
+        return total_borrowings / total_rev
+    return 0.0
+
+
+def section_iscr(pnl: dict | None, bs: dict | None) -> float:
+    """ISCR value from the pnl and bs sections, 0 if either section is missing or interest expenses are -1."""
+    if pnl is None or bs is None:
+        return 0.0
+    pbitda = pnl.get("profitBeforeInterestAndTaxAndDepreciationAndAmortization", 0)
+    interest_expenses = bs.get("interestExpenses", 0)
+    if interest_expenses + 1 == 0:
+        return 0.0
+    return (pbitda + 1) / (interest_expenses + 1)
+
+
+def _iscr_flag(iscr_value: float) -> int:
+    """Flag color for an ISCR value."""
+    return _RED_GREEN_LUT[iscr_value >= ISCR_THRESHOLD]
+
+
+def _total_revenue_5cr_flag(total_rev: float) -> int:
+    """Flag color for a total revenue value."""
+    return _RED_GREEN_LUT[total_rev >= REVENUE_5CR_THRESHOLD]
+
+
+def _borrowing_to_revenue_flag(borrowing_to_revenue_ratio: float) -> int:
+    """Flag color for a borrowings to revenue ratio."""
+    return _AMBER_GREEN_LUT[borrowing_to_revenue_ratio <= BORROWING_RATIO_THRESHOLD]
+
+
+def total_revenue(data: dict, financial_index: int) -> float:
     """
     Calculate the total revenue from the financial data at the given index.
 
@@ -43,21 +118,17 @@ def total_revenue(data: dict, financial_index):
     Returns:
     - float: The net revenue value from the financial data.
     """
-    try:
-        pnl_section = data["financials"][financial_index]["lineItems"]["pnl"]
-        total_revenue = pnl_section["netRevenue"]
-        return total_revenue
-    except KeyError:
-        return 0.0  # Return 0 if the data is missing or not in the expected format
+    pnl_section, _ = line_items(data, financial_index)
+    return section_total_revenue(pnl_section)
 
 
-def total_borrowing(data: dict, financial_index):
+def total_borrowing(data: dict, financial_index: int) -> float:
     """
     Calculate the ratio of total borrowings to total revenue for the financial data at the given index.
 
     This function sums the long-term and short-term borrowings from the balance sheet ("bs")
-    section of the financial data. It then divides this sum by the total revenue, calculated
-    by calling the `total_revenue` function.
+    section of the financial data. It then divides this sum by the net revenue of the same
+    entry's "pnl" section, taken from `section_total_revenue`.
 
     Parameters:
     - data (dict): A dictionary containing financial data.
@@ -66,23 +137,11 @@ def total_borrowing(data: dict, financial_index):
     Returns:
     - float: The ratio of total borrowings to total revenue.
     """
-    try:
-        bs_section = data["financials"][financial_index]["lineItems"]["bs"]
-        long_term_borrowings = bs_section.get("longTermBorrowings", 0)
-        short_term_borrowings = bs_section.get("shortTermBorrowings", 0)
-        total_borrowings = long_term_borrowings + short_term_borrowings
+    pnl_section, bs_section = line_items(data, financial_index)
+    return section_total_borrowing(bs_section, section_total_revenue(pnl_section))
 
-        total_rev = total_revenue(data, financial_index)
-        if total_rev != 0:
-            borrowing_to_revenue_ratio = total_borrowings / total_rev
-            return borrowing_to_revenue_ratio
-        else:
-            return 0.0
-    except KeyError:
-        return 0.0  # Return 0 if the data is missing or not in the expected format
 
-
-def iscr_flag(data: dict, financial_index):
+def iscr_flag(data: dict, financial_index: int) -> int:
     """
     Determine the flag color based on the Interest Service Coverage Ratio (ISCR) value.
 
@@ -95,16 +154,12 @@ def iscr_flag(data: dict, financial_index):
     - financial_index (int): The index of the financial entry to be used for the ISCR calculation.
 
     Returns:
-    - FLAGS.GREEN or FLAGS.RED: The flag color based on the ISCR value.
+    - GREEN or RED: The flag color based on the ISCR value.
     """
-    iscr_value = iscr(data, financial_index)
-    if iscr_value >= 2:
-        return FLAGS.GREEN
-    else:
-        return FLAGS.RED
+    return _iscr_flag(iscr(data, financial_index))
 
 
-def total_revenue_5cr_flag(data: dict, financial_index):
+def total_revenue_5cr_flag(data: dict, financial_index: int) -> int:
     """
     Determine the flag color based on whether the total revenue exceeds 50 million.
 
@@ -117,22 +172,19 @@ def total_revenue_5cr_flag(data: dict, financial_index):
     - financial_index (int): The index of the financial entry to be used for the revenue calculation.
 
     Returns:
-    - FLAGS.GREEN or FLAGS.RED: The flag color based on the total revenue.
+    - GREEN or RED: The flag color based on the total revenue.
     """
-    total_rev = total_revenue(data, financial_index)
-    if total_rev >= 50000000:  # 50 million
-        return FLAGS.GREEN
-    else:
-        return FLAGS.RED
+    return _total_revenue_5cr_flag(total_revenue(data, financial_index))
 
 
-def iscr(data: dict, financial_index):
+def iscr(data: dict, financial_index: int) -> float:
     """
     Calculate the Interest Service Coverage Ratio (ISCR) for the financial data at the given index.
 
     ISCR is a ratio that measures how well a company can cover its interest payments on outstanding debt.
     It is calculated as the sum of profit before interest and tax, and depreciation, increased by 1,
     divided by the sum of interest expenses increased by 1. The addition of 1 is to avoid division by zero.
+    Interest expenses of exactly -1 would still divide by zero, so the ISCR is reported as 0 for them.
 
     Parameters:
     - data (dict): A dictionary containing financial data.
@@ -141,20 +193,11 @@ def iscr(data: dict, financial_index):
     Returns:
     - float: The ISCR value.
     """
-    try:
-        pnl_section = data["financials"][financial_index]["lineItems"]["pnl"]
-        bs_section = data["financials"][financial_index]["lineItems"]["bs"]
-
-        pbitda = pnl_section.get("profitBeforeInterestAndTaxAndDepreciationAndAmortization", 0)
-        interest_expenses = bs_section.get("interestExpenses", 0)
-
-        iscr_value = (pbitda + 1) / (interest_expenses + 1)
-        return iscr_value
-    except KeyError:
-        return 0.0  # Return 0 if the data is missing or not in the expected format
+    pnl_section, bs_section = line_items(data, financial_index)
+    return section_iscr(pnl_section, bs_section)
 
 
-def borrowing_to_revenue_flag(data: dict, financial_index):
+def borrowing_to_revenue_flag(data: dict, financial_index: int) -> int:
     """
     Determine the flag color based on the ratio of total borrowings to total revenue.
 
@@ -167,10 +210,6 @@ def borrowing_to_revenue_flag(data: dict, financial_index):
     - financial_index (int): The index of the financial entry to be used for the ratio calculation.
 
     Returns:
-    - FLAGS.GREEN
+    - GREEN or AMBER: The flag color based on the borrowings to revenue ratio.
     """
-    borrowing_to_revenue_ratio = total_borrowing(data, financial_index)
-    if borrowing_to_revenue_ratio <= 0.25:
-        return FLAGS.GREEN
-    else:
-        return FLAGS.AMBER
\ No newline at end of file
+    return _borrowing_to_revenue_flag(total_borrowing(data, financial_index))
\ No newline at end of file
@@ -0,0 +1,60 @@
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True)
+def eval_flags(
+    net_rev,
+    lt,
+    st,
+    pbitda,
+    interest,
+    has_pnl,
+    has_bs,
+    revenue_threshold,
+    borrowing_ratio_threshold,
+    iscr_threshold,
+    green,
+    amber,
+    red,
+    out_rev,
+    out_br,
+    out_iscr,
+):
+    """
+    Evaluate the three model flags for a batch of companies in a single fused pass.
+
+    Every input column is read once and every output column written once, so the kernel is bound by
+    memory bandwidth rather than by the interpreter.
+
+    The thresholds and flag values are passed in rather than read from `rules` as globals: numba freezes
+    globals into the compiled kernel, and its on-disk cache is only invalidated when this file changes.
+
+    Parameters:
+    - net_rev (np.ndarray): Net revenue per company.
+    - lt (np.ndarray): Long term borrowings per company.
+    - st (np.ndarray): Short term borrowings per company.
+    - pbitda (np.ndarray): Profit before interest, tax, depreciation and amortization per company.
+    - interest (np.ndarray): Interest expenses per company.
+    - has_pnl (np.ndarray): Whether the pnl section exists, its values are ignored otherwise.
+    - has_bs (np.ndarray): Whether the bs section exists, its values are ignored otherwise.
+    - revenue_threshold (float): Net revenue at or above which TOTAL_REVENUE_5CR_FLAG is green.
+    - borrowing_ratio_threshold (float): Borrowing ratio at or below which BORROWING_TO_REVENUE_FLAG is green.
+    - iscr_threshold (float): ISCR at or above which ISCR_FLAG is green.
+    - green (int): The GREEN flag value.
+    - amber (int): The AMBER flag value.
+    - red (int): The RED flag value.
+    - out_rev (np.ndarray): Output array for the TOTAL_REVENUE_5CR_FLAG values.
+    - out_br (np.ndarray): Output array for the BORROWING_TO_REVENUE_FLAG values.
+    - out_iscr (np.ndarray): Output array for the ISCR_FLAG values.
+    """
+    for i in prange(net_rev.shape[0]):
+        rev = net_rev[i] if has_pnl[i] else 0.0
+
+        out_rev[i] = green if rev >= revenue_threshold else red
+
+        ratio = (lt[i] + st[i]) / rev if has_bs[i] and rev != 0 else 0.0
+        out_br[i] = green if ratio <= borrowing_ratio_threshold else amber
+
+        has_iscr = has_pnl[i] and has_bs[i] and interest[i] + 1 != 0
+        iscr_value = (pbitda[i] + 1) / (interest[i] + 1) if has_iscr else 0.0
+        out_iscr[i] = green if iscr_value >= iscr_threshold else red
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+import batch
+from model import probe_model_5l_profit
+from rules import RED
+
+
+def _record(pnl=None, bs=None, nature="STANDALONE"):
+    line_items = {}
+    if pnl is not None:
+        line_items["pnl"] = pnl
+    if bs is not None:
+        line_items["bs"] = bs
+    return {"financials": [{"nature": nature, "lineItems": line_items}]}
+
+
+FULL_PNL = {"netRevenue": 60000000, "profitBeforeInterestAndTaxAndDepreciationAndAmortization": 900}
+FULL_BS = {"longTermBorrowings": 5000000, "shortTermBorrowings": 1000000, "interestExpenses": 100}
+
+RECORDS = [
+    _record(FULL_PNL, FULL_BS),
+    _record({"netRevenue": 0}, {"longTermBorrowings": 10, "shortTermBorrowings": 10, "interestExpenses": 0}),
+    _record({}, FULL_BS),
+    _record(None, FULL_BS),
+    _record(FULL_PNL, None),
+    _record(None, None),
+    {"financials": [{"nature": "STANDALONE"}]},
+    # The +1 in the ISCR denominator does not protect against interest expenses of -1
+    _record(FULL_PNL, {"longTermBorrowings": 0, "shortTermBorrowings": 0, "interestExpenses": -1}),
+    # Values sitting exactly on the thresholds
+    _record(
+        {"netRevenue": 50000000, "profitBeforeInterestAndTaxAndDepreciationAndAmortization": 3},
+        {"longTermBorrowings": 10000000, "shortTermBorrowings": 2500000, "interestExpenses": 1},
+    ),
+    # The first standalone entry is used, index 0 if there is none
+    {"financials": [_record(nature="CONSOLIDATED")["financials"][0], _record(FULL_PNL, FULL_BS)["financials"][0]]},
+    {"financials": [_record(FULL_PNL, FULL_BS, nature="CONSOLIDATED")["financials"][0]]},
+]
+
+
+@pytest.fixture(params=["kernel", "numpy"])
+def kernel(request, monkeypatch):
+    if request.param == "numpy":
+        monkeypatch.setattr(batch, "eval_flags", None)
+    elif batch.eval_flags is None:
+        pytest.skip("numba is not installed")
+
+
+def test_batch_matches_scalar_rules(kernel):
+    flags = batch.probe_model_5l_profit_batch(RECORDS)
+
+    assert flags.shape == (len(RECORDS), 3)
+    for record, record_flags in zip(RECORDS, flags):
+        assert tuple(record_flags) == tuple(probe_model_5l_profit(record)["flags"].values())
+
+
+def test_batch_of_no_records(kernel):
+    assert batch.probe_model_5l_profit_batch([]).shape == (0, 3)
+
+
+def test_periods_match_scalar_rules_per_entry(kernel):
+    data = {"financials": [financial for record in RECORDS for financial in record["financials"]]}
+
+    flags = batch.probe_model_5l_profit_periods(data)
+
+    assert flags.shape == (len(data["financials"]), 3)
+    for financial, period_flags in zip(data["financials"], flags):
+        assert tuple(period_flags) == tuple(probe_model_5l_profit({"financials": [financial]})["flags"].values())
+
+
+def test_financials_array_keeps_long_natures():
+    nature = "STANDALONE_RESTATED_FOR_MERGER"
+    financials = batch.financials_array({"financials": [{"nature": nature}, {}]})
+
+    assert list(financials["nature"]) == [nature, ""]
+    assert batch.financials_array({}).shape == (0,)
+
+
+def test_financials_array_keeps_real_values_and_flags_missing_sections():
+    financials = batch.financials_array({"financials": [{"nature": "STANDALONE", "lineItems": {"pnl": FULL_PNL}}]})
+
+    row = financials[0]
+    assert row["rev"] == FULL_PNL["netRevenue"]
+    assert row["pbitda"] == FULL_PNL["profitBeforeInterestAndTaxAndDepreciationAndAmortization"]
+    assert row["has_pnl"] and not row["has_bs"]
+    assert np.isnan(row["lt"]) and np.isnan(row["st"]) and np.isnan(row["int"])
+
+
+def test_thresholds_are_read_at_call_time(kernel, monkeypatch):
+    # The numba kernel is cached on disk, so a threshold frozen into it would outlive a change in rules
+    monkeypatch.setattr(batch, "REVENUE_5CR_THRESHOLD", 70000000)
+
+    assert batch.probe_model_5l_profit_batch([_record(FULL_PNL, FULL_BS)])[0, 0] == RED
@@ -0,0 +1,48 @@
+import io
+
+import orjson
+import pytest
+
+from model import probe_model_5l_profit, probe_model_5l_profit_stream
+
+STANDALONE = {
+    "nature": "STANDALONE",
+    "lineItems": {
+        "pnl": {"netRevenue": 60000000, "profitBeforeInterestAndTaxAndDepreciationAndAmortization": 900},
+        "bs": {"longTermBorrowings": 1000000, "shortTermBorrowings": 500000, "interestExpenses": 100},
+    },
+}
+CONSOLIDATED = {
+    "nature": "CONSOLIDATED",
+    "lineItems": {
+        "pnl": {"netRevenue": 1000, "profitBeforeInterestAndTaxAndDepreciationAndAmortization": 0},
+        "bs": {"longTermBorrowings": 900, "shortTermBorrowings": 0, "interestExpenses": 0},
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"metadata": {}, "data": {"financials": [CONSOLIDATED, STANDALONE, CONSOLIDATED]}},
+        {"data": {"financials": [CONSOLIDATED, CONSOLIDATED]}},
+        {"data": {"financials": []}},
+        {"data": {}},
+    ],
+    ids=["standalone", "no-standalone", "empty-financials", "missing-financials"],
+)
+def test_stream_matches_parsed_document(document):
+    content = orjson.dumps(document)
+
+    expected = probe_model_5l_profit(orjson.loads(content)["data"])
+
+    assert probe_model_5l_profit_stream(io.BytesIO(content)) == expected
+
+
+def test_stream_without_data_raises_like_parsed_document():
+    content = orjson.dumps({"metadata": {"financials": [STANDALONE]}})
+
+    with pytest.raises(KeyError):
+        probe_model_5l_profit(orjson.loads(content)["data"])
+    with pytest.raises(KeyError):
+        probe_model_5l_profit_stream(io.BytesIO(content))
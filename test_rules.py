@@ -0,0 +1,82 @@
+import pytest
+
+from rules import (
+    AMBER,
+    GREEN,
+    RED,
+    borrowing_to_revenue_flag,
+    iscr,
+    iscr_flag,
+    latest_financial_index,
+    line_items,
+    total_borrowing,
+    total_revenue,
+    total_revenue_5cr_flag,
+)
+
+
+@pytest.mark.parametrize(
+    "data, financial_index",
+    [
+        ({}, 0),
+        ({}, 1),
+        ({"financials": None}, 0),
+        ({"financials": []}, 0),
+        ({"financials": [{"nature": "STANDALONE"}]}, 3),
+        ({"financials": [{"nature": "STANDALONE"}]}, 0),
+    ],
+)
+def test_missing_data_scores_as_no_sections(data, financial_index):
+    assert line_items(data, financial_index) == (None, None)
+    assert total_revenue(data, financial_index) == 0.0
+    assert total_borrowing(data, financial_index) == 0.0
+    assert iscr(data, financial_index) == 0.0
+    assert iscr_flag(data, financial_index) == RED
+    assert total_revenue_5cr_flag(data, financial_index) == RED
+    assert borrowing_to_revenue_flag(data, financial_index) == GREEN
+
+
+def test_latest_financial_index_agrees_with_line_items():
+    data = {"financials": None}
+    assert line_items(data, latest_financial_index(data)) == (None, None)
+
+
+def test_rules_on_complete_entry():
+    data = {
+        "financials": [
+            {"nature": "CONSOLIDATED"},
+            {
+                "nature": "STANDALONE",
+                "lineItems": {
+                    "pnl": {"netRevenue": 40000000, "profitBeforeInterestAndTaxAndDepreciationAndAmortization": 99},
+                    "bs": {"longTermBorrowings": 8000000, "shortTermBorrowings": 4000000, "interestExpenses": 49},
+                },
+            },
+        ]
+    }
+    index = latest_financial_index(data)
+
+    assert index == 1
+    assert total_revenue(data, index) == 40000000
+    assert total_borrowing(data, index) == 0.3
+    assert iscr(data, index) == 2.0
+    assert total_revenue_5cr_flag(data, index) == RED
+    assert borrowing_to_revenue_flag(data, index) == AMBER
+    assert iscr_flag(data, index) == GREEN
+
+
+def test_iscr_with_interest_expenses_of_minus_one():
+    data = {
+        "financials": [
+            {
+                "nature": "STANDALONE",
+                "lineItems": {
+                    "pnl": {"profitBeforeInterestAndTaxAndDepreciationAndAmortization": 500},
+                    "bs": {"interestExpenses": -1},
+                },
+            }
+        ]
+    }
+
+    assert iscr(data, 0) == 0.0
+    assert iscr_flag(data, 0) == RED